@@ -1,10 +1,25 @@
-from django.contrib.auth.hashers import check_password
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import cache
+from django.db.models import Case, When, Value
+from django.db.models.functions import Lower
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework import exceptions
 from .models import User
 
 
+# Хеш-заглушка: проверяется, когда пользователь не найден,
+# чтобы время ответа не выдавало существование username
+DUMMY_HASH = make_password('dummy-password')
+
+# Время жизни закешированного пользователя JWT (секунды)
+USER_CACHE_TIMEOUT = 30
+
+
+def user_cache_key(user_id):
+    return f'jwt_user:{user_id}'
+
+
 class CustomJWTAuthentication(JWTAuthentication):
     """
     Кастомная JWT аутентификация для работы с нашей моделью User
@@ -14,12 +29,19 @@ class CustomJWTAuthentication(JWTAuthentication):
         """
         Получаем пользователя из нашей модели User по user_id из токена
         """
-        try:
-            user_id = validated_token.get('user_id')
-            user = User.objects.get(id=user_id)
+        user_id = validated_token.get('user_id')
+        cache_key = user_cache_key(user_id)
+        user = cache.get(cache_key)
+        if user is not None:
             return user
-        except User.DoesNotExist:
+        
+        # Разрешениям нужен только id, пароль и даты не выбираем
+        user = User.objects.filter(id=user_id).only('id', 'username').first()
+        if user is None:
             raise exceptions.AuthenticationFailed('User not found')
+        
+        cache.set(cache_key, user, USER_CACHE_TIMEOUT)
+        return user
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
@@ -32,14 +54,33 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         username = attrs.get('username')
         password = attrs.get('password')
         
-        try:
-            user = User.objects.get(username=username)
-        except User.DoesNotExist:
-            from rest_framework_simplejwt.exceptions import AuthenticationFailed
-            raise AuthenticationFailed('No active account found with the given credentials')
+        # Поиск без учета регистра по функциональному индексу LOWER(username).
+        # Обе стороны приводит к нижнему регистру БД: LOWER() в SQLite не трогает
+        # не-ASCII символы, и Python-овский lower() с ним бы не совпал.
+        # Регистр не-ASCII имен (например, 'Иван' / 'иван') игнорируется только
+        # на БД с Unicode LOWER(), например PostgreSQL; в SQLite такие имена
+        # нужно вводить в точном регистре.
+        # При совпадении нескольких пользователей первым идет точное совпадение
+        user = (
+            User.objects
+            .annotate(username_lower=Lower('username'))
+            .filter(username_lower=Lower(Value(username)))
+            .order_by(Case(When(username=username, then=Value(0)), default=Value(1)), 'id')
+            .only('id', 'username', 'password')
+            .first()
+        )
+        
+        def upgrade_password(raw_password):
+            # Перехешируем старый (например, PBKDF2) пароль текущим хешером
+            user.set_password(raw_password)
+            user.save(update_fields=['password'])
         
-        # Проверяем пароль
-        if not check_password(password, user.password):
+        # Проверяем пароль всегда, даже если пользователь не найден
+        if user is None:
+            password_ok = check_password(password, DUMMY_HASH)
+        else:
+            password_ok = check_password(password, user.password, setter=upgrade_password)
+        if user is None or not password_ok:
             from rest_framework_simplejwt.exceptions import AuthenticationFailed
             raise AuthenticationFailed('No active account found with the given credentials')
         
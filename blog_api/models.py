@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.hashers import make_password
 
 class User(models.Model):
@@ -6,6 +7,21 @@ class User(models.Model):
     
     password = models.CharField(max_length=128)
     date_joined = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        indexes = [
+            # Вход по username без учета регистра
+            models.Index(Lower('username'), name='user_username_lower_idx'),
+        ]
+
+    @property
+    def is_authenticated(self):
+        # Как у django.contrib.auth: пользователь из БД всегда аутентифицирован
+        return True
+    
+    @property
+    def is_anonymous(self):
+        return False
 
     def set_password(self, raw_password):
         self.password = make_password(raw_password)
@@ -21,6 +37,13 @@ class Post(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_published = models.BooleanField(default=False)
     
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # Лента опубликованных постов для гостей
+            models.Index(fields=['-created_at'], condition=models.Q(is_published=True), name='post_pub_created'),
+        ]
+    
     def __str__(self):
         return self.title
 
@@ -1,6 +1,10 @@
 from rest_framework import permissions
 
 
+# Безопасные методы (GET, HEAD, OPTIONS) для проверки за O(1)
+SAFE_METHODS = frozenset(permissions.SAFE_METHODS)
+
+
 class IsAuthorOrReadOnly(permissions.BasePermission):
     """
     Кастомное разрешение для постов и комментариев:
@@ -10,7 +14,7 @@ class IsAuthorOrReadOnly(permissions.BasePermission):
     
     def has_object_permission(self, request, view, obj):
         # Разрешить GET, HEAD или OPTIONS запросы (только чтение)
-        if request.method in permissions.SAFE_METHODS:
+        if request.method in SAFE_METHODS:
             return True
         
         # Разрешить изменение только автору
@@ -25,7 +29,7 @@ class IsAuthenticatedOrReadOnlyPublished(permissions.BasePermission):
     
     def has_permission(self, request, view):
         # Разрешить чтение всем
-        if request.method in permissions.SAFE_METHODS:
+        if request.method in SAFE_METHODS:
             return True
         
         # Создание/изменение только для авторизованных
@@ -33,7 +37,7 @@ class IsAuthenticatedOrReadOnlyPublished(permissions.BasePermission):
     
     def has_object_permission(self, request, view, obj):
         # Если метод безопасный (GET, HEAD, OPTIONS)
-        if request.method in permissions.SAFE_METHODS:
+        if request.method in SAFE_METHODS:
             # Гости видят только опубликованные посты
             if not request.user or not request.user.is_authenticated:
                 return obj.is_published
@@ -1,14 +1,66 @@
+import copy
+
 from rest_framework import serializers
 from .models import User, Post, Comment
 from django.contrib.auth.hashers import check_password
 
 
-class UserSerializer(serializers.ModelSerializer):
+class CachedFieldsMixin:
+    """
+    Кеширует поля ModelSerializer на уровне класса.
+    Интроспекция модели выполняется один раз, дальше каждый экземпляр
+    получает свежие несвязанные копии полей.
+    """
+    _fields_cache = {}
+    
+    def get_fields(self):
+        cls = type(self)
+        if cls not in CachedFieldsMixin._fields_cache:
+            CachedFieldsMixin._fields_cache[cls] = super().get_fields()
+        # deepcopy пересоздает поле из исходных аргументов (как DRF для declared fields),
+        # поэтому parent/field_name у копий не привязаны, а вложенные child не разделяются
+        return copy.deepcopy(CachedFieldsMixin._fields_cache[cls])
+
+
+class UpdateFieldsMixin:
+    """
+    Сохраняет при обновлении только переданные поля (UPDATE ... SET по ним),
+    а не все колонки модели. updated_at добавляется явно, так как auto_now
+    срабатывает только для полей из update_fields.
+    """
+    
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance
+
+
+class PostBulkCreateSerializer(serializers.ListSerializer):
+    """Создание нескольких постов одним INSERT через bulk_create"""
+    # Ограничение размера пачки: весь список уходит в один INSERT
+    max_batch_size = 100
+    
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('max_length', self.max_batch_size)
+        super().__init__(*args, **kwargs)
+    
+    def create(self, validated_data):
+        posts = Post.objects.bulk_create([Post(**attrs) for attrs in validated_data])
+        for post in posts:
+            # У новых постов нет комментариев: заполняем счетчик и кеш предзагрузки,
+            # чтобы ответ сериализовался без запросов на каждый пост
+            post.comments_count = 0
+            post._prefetched_objects_cache = {'comments': Comment.objects.none()}
+        return posts
+
+
+class UserSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True, style={'input_type': 'password'})
     
     class Meta:
         model = User
-        fields = ['id', 'username', 'email', 'password', 'date_joined']
+        fields = ['id', 'username', 'password', 'date_joined']
         read_only_fields = ['id', 'date_joined']
     
     def create(self, validated_data):
@@ -18,8 +70,16 @@ class UserSerializer(serializers.ModelSerializer):
         return user
 
 
-class CommentSerializer(serializers.ModelSerializer):
-    author = UserSerializer(read_only=True)
+class AuthorMiniSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    """Облегченное представление автора для вложения в посты и комментарии"""
+    
+    class Meta:
+        model = User
+        fields = ['id', 'username']
+
+
+class CommentSerializer(CachedFieldsMixin, UpdateFieldsMixin, serializers.ModelSerializer):
+    author = AuthorMiniSerializer(read_only=True)
     author_id = serializers.IntegerField(write_only=True, required=False)
     
     class Meta:
@@ -28,8 +88,8 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at', 'post']
 
 
-class PostSerializer(serializers.ModelSerializer):
-    author = UserSerializer(read_only=True)
+class PostSerializer(CachedFieldsMixin, UpdateFieldsMixin, serializers.ModelSerializer):
+    author = AuthorMiniSerializer(read_only=True)
     comments = CommentSerializer(many=True, read_only=True)
     comments_count = serializers.SerializerMethodField()
     
@@ -37,20 +97,46 @@ class PostSerializer(serializers.ModelSerializer):
         model = Post
         fields = ['id', 'author', 'title', 'body', 'created_at', 'updated_at', 'is_published', 'comments', 'comments_count']
         read_only_fields = ['id', 'author', 'created_at', 'updated_at']
+        list_serializer_class = PostBulkCreateSerializer
     
     def get_comments_count(self, obj):
+        if hasattr(obj, 'comments_count'):
+            return obj.comments_count
+        # Если комментарии уже предзагружены, считаем их без запроса к БД
+        if 'comments' in getattr(obj, '_prefetched_objects_cache', {}):
+            return len(obj.comments.all())
         return obj.comments.count()
 
 
-class PostListSerializer(serializers.ModelSerializer):
-    """Упрощенный сериализатор для списка постов (без комментариев)"""
-    author = UserSerializer(read_only=True)
+class PostListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    """Упрощенный сериализатор для списка постов (без комментариев и текста поста)"""
+    author = AuthorMiniSerializer(read_only=True)
     comments_count = serializers.SerializerMethodField()
     
     class Meta:
         model = Post
-        fields = ['id', 'author', 'title', 'body', 'created_at', 'updated_at', 'is_published', 'comments_count']
+        fields = ['id', 'author', 'title', 'created_at', 'updated_at', 'is_published', 'comments_count']
         read_only_fields = ['id', 'author', 'created_at', 'updated_at']
     
     def get_comments_count(self, obj):
+        if hasattr(obj, 'comments_count'):
+            return obj.comments_count
         return obj.comments.count()
+
+
+class PostListRowSerializer(serializers.Serializer):
+    """
+    Сериализатор строк .values() для списка постов.
+    Повторяет формат PostListSerializer, но работает со словарями,
+    без создания моделей Post и User для каждой строки.
+    """
+    id = serializers.IntegerField()
+    author = serializers.SerializerMethodField()
+    title = serializers.CharField()
+    created_at = serializers.DateTimeField()
+    updated_at = serializers.DateTimeField()
+    is_published = serializers.BooleanField()
+    comments_count = serializers.IntegerField()
+    
+    def get_author(self, row):
+        return {'id': row['author__id'], 'username': row['author__username']}
@@ -0,0 +1,12 @@
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .authentication import user_cache_key
+from .models import User
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_jwt_user_cache(sender, instance, **kwargs):
+    """Сбрасываем закешированного пользователя JWT при изменении или удалении"""
+    cache.delete(user_cache_key(instance.pk))
@@ -1,3 +1,177 @@
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import User, Post, Comment
+from .serializers import PostSerializer, PostBulkCreateSerializer
+from .views import PostViewSet
+
+
+class PostListTests(TestCase):
+    """Список постов для гостей"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create(username='author', password='x')
+    
+    def create_post(self, title, minutes_ago, is_published=True):
+        post = Post.objects.create(author=self.author, title=title, body='body', is_published=is_published)
+        Post.objects.filter(pk=post.pk).update(created_at=timezone.now() - timedelta(minutes=minutes_ago))
+        return post
+    
+    def test_guest_list_is_newest_first(self):
+        self.create_post('old', minutes_ago=10)
+        self.create_post('new', minutes_ago=1)
+        self.create_post('middle', minutes_ago=5)
+        self.create_post('draft', minutes_ago=0, is_published=False)
+        
+        response = self.client.get('/api/v1/posts/')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([post['title'] for post in response.data['results']], ['new', 'middle', 'old'])
+    
+    def test_list_payload_shape(self):
+        post = self.create_post('post', minutes_ago=1)
+        Comment.objects.create(post=post, author=self.author, body='comment')
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/v1/posts/')
+        
+        item = response.data['results'][0]
+        self.assertEqual(
+            list(item),
+            ['id', 'author', 'title', 'created_at', 'updated_at', 'is_published', 'comments_count'],
+        )
+        self.assertEqual(item['author'], {'id': self.author.id, 'username': 'author'})
+        self.assertEqual(item['comments_count'], 1)
+        # Тексты постов не читаются из БД
+        self.assertFalse(any('"body"' in query['sql'] for query in queries.captured_queries))
+    
+    def test_list_queryset_is_ordered_without_published_filter(self):
+        # Авторизованный пользователь: фильтр is_published не применяется
+        view = PostViewSet(action='list', request=SimpleNamespace(user=SimpleNamespace(is_authenticated=True)))
+        self.create_post('old', minutes_ago=10)
+        self.create_post('new', minutes_ago=1)
+        self.create_post('draft', minutes_ago=5, is_published=False)
+        
+        queryset = view.get_queryset()
+        
+        self.assertTrue(queryset.ordered)
+        self.assertEqual(list(queryset.values_list('title', flat=True)), ['new', 'draft', 'old'])
+    
+    def test_conditional_get_returns_304_with_same_headers(self):
+        self.create_post('post', minutes_ago=1)
+        response = self.client.get('/api/v1/posts/')
+        etag = response['ETag']
+        
+        not_modified = self.client.get('/api/v1/posts/', HTTP_IF_NONE_MATCH=etag)
+        
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], etag)
+        self.assertIn('Authorization', not_modified['Vary'])
+        self.assertIn('Authorization', response['Vary'])
+    
+    def test_new_comment_changes_etag(self):
+        post = self.create_post('post', minutes_ago=1)
+        etag = self.client.get('/api/v1/posts/')['ETag']
+        
+        Comment.objects.create(post=post, author=self.author, body='comment')
+        response = self.client.get('/api/v1/posts/', HTTP_IF_NONE_MATCH=etag)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['comments_count'], 1)
+
+
+class TokenObtainTests(TestCase):
+    """Получение JWT токена по username и паролю"""
+    
+    url = '/api/v1/auth/token/'
+    
+    def setUp(self):
+        self.client = APIClient()
+    
+    def register(self, username, password):
+        response = self.client.post('/api/v1/users/', {'username': username, 'password': password}, format='json')
+        self.assertEqual(response.status_code, 201)
+    
+    def login(self, username, password):
+        return self.client.post(self.url, {'username': username, 'password': password}, format='json')
+    
+    def test_exact_case_non_ascii_username(self):
+        self.register('Иван', 'secret-pass-1')
+        
+        response = self.login('Иван', 'secret-pass-1')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['username'], 'Иван')
+    
+    def test_username_case_is_ignored(self):
+        self.register('Alice', 'secret-pass-1')
+        
+        response = self.login('aLICE', 'secret-pass-1')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['username'], 'Alice')
+    
+    def test_wrong_password_and_unknown_user_are_rejected(self):
+        self.register('Иван', 'secret-pass-1')
+        
+        self.assertEqual(self.login('Иван', 'wrong').status_code, 401)
+        self.assertEqual(self.login('Пётр', 'secret-pass-1').status_code, 401)
+
 
-# Create your tests here.
+class PostBulkCreateTests(TestCase):
+    """Создание нескольких постов одним запросом"""
+    
+    def setUp(self):
+        self.author = User.objects.create(username='author', password='x')
+    
+    def authenticate(self, client):
+        self.author.set_password('secret-pass-1')
+        self.author.save()
+        response = client.post(
+            '/api/v1/auth/token/', {'username': 'author', 'password': 'secret-pass-1'}, format='json',
+        )
+        client.credentials(HTTP_AUTHORIZATION='Bearer ' + response.data['access'])
+    
+    def test_post_list_payload_creates_posts(self):
+        client = APIClient()
+        self.authenticate(client)
+        data = [{'title': 'first', 'body': 'body', 'is_published': True}, {'title': 'second', 'body': 'body'}]
+        
+        response = client.post('/api/v1/posts/', data, format='json')
+        
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([post['title'] for post in response.data], ['first', 'second'])
+        self.assertEqual({post['author']['id'] for post in response.data}, {self.author.id})
+        self.assertEqual(Post.objects.filter(author=self.author).count(), 2)
+    
+    def test_post_list_payload_requires_authentication(self):
+        response = APIClient().post('/api/v1/posts/', [{'title': 'post', 'body': 'body'}], format='json')
+        
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(Post.objects.exists())
+    
+    def test_bulk_create_and_response_use_one_query(self):
+        data = [{'title': f'post {i}', 'body': 'body'} for i in range(10)]
+        serializer = PostSerializer(data=data, many=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        
+        with self.assertNumQueries(1):
+            serializer.save(author=self.author)
+            response_data = serializer.data
+        
+        self.assertEqual(Post.objects.count(), 10)
+        self.assertEqual({post['comments_count'] for post in response_data}, {0})
+        self.assertEqual({len(post['comments']) for post in response_data}, {0})
+    
+    def test_batch_size_is_limited(self):
+        data = [{'title': 'post', 'body': 'body'}] * (PostBulkCreateSerializer.max_batch_size + 1)
+        serializer = PostSerializer(data=data, many=True)
+        
+        self.assertFalse(serializer.is_valid())
@@ -1,13 +1,19 @@
+import hashlib
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.shortcuts import get_object_or_404
+from django.db.models import Count, Max, Prefetch
+from django.utils.cache import get_conditional_response, patch_vary_headers, quote_etag
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 from .models import User, Post, Comment
-from .serializers import UserSerializer, PostSerializer, PostListSerializer, CommentSerializer
+from .serializers import (
+    UserSerializer, PostSerializer, PostListSerializer, PostListRowSerializer, CommentSerializer,
+)
 from .permissions import IsAuthorOrReadOnly, IsAuthenticatedOrReadOnlyPublished
 from .authentication import CustomTokenObtainPairSerializer
 
@@ -39,7 +45,7 @@ class PostViewSet(viewsets.ModelViewSet):
     Авторизованные пользователи могут создавать посты и видеть все.
     Редактировать/удалять может только автор.
     """
-    queryset = Post.objects.all().select_related('author').prefetch_related('comments')
+    queryset = Post.objects.all().select_related('author')
     permission_classes = [IsAuthenticatedOrReadOnlyPublished]
     
     def get_serializer_class(self):
@@ -47,13 +53,81 @@ class PostViewSet(viewsets.ModelViewSet):
             return PostListSerializer
         return PostSerializer
     
+    def get_serializer(self, *args, **kwargs):
+        # Список в теле POST создает несколько постов сразу
+        if self.action == 'create' and isinstance(kwargs.get('data'), list):
+            kwargs['many'] = True
+        return super().get_serializer(*args, **kwargs)
+    
     def get_queryset(self):
         queryset = super().get_queryset()
+        if self.action == 'list':
+            # Список только читает данные: выбираем словари через values(),
+            # без body и без создания моделей для каждой строки.
+            # values() идет до annotate(), иначе body попадет в GROUP BY
+            queryset = queryset.values(
+                'id', 'title', 'created_at', 'updated_at', 'is_published',
+                'author__id', 'author__username',
+            )
+        # Количество комментариев считается одним запросом через GROUP BY
+        queryset = queryset.annotate(comments_count=Count('comments'))
+        # Meta.ordering не применяется к запросам с GROUP BY, задаем порядок явно
+        queryset = queryset.order_by('-created_at', '-id')
+        # Комментарии нужны только детальному представлению поста
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related(
+                Prefetch('comments', queryset=Comment.objects.select_related('author').defer('author__password'))
+            )
+        return self.filter_visible(queryset)
+    
+    def filter_visible(self, queryset):
         # Гости видят только опубликованные посты
         if not self.request.user or not self.request.user.is_authenticated:
             queryset = queryset.filter(is_published=True)
         return queryset
     
+    def get_list_etag(self):
+        """
+        ETag списка: зависит от набора видимых постов, их комментариев,
+        параметров запроса (страница) и того, гость ли пользователь
+        """
+        stats = self.filter_visible(Post.objects.all()).aggregate(
+            posts_count=Count('id', distinct=True),
+            posts_updated=Max('updated_at'),
+            comments_count=Count('comments'),
+            comments_updated=Max('comments__updated_at'),
+        )
+        key = '|'.join([
+            str(bool(self.request.user and self.request.user.is_authenticated)),
+            self.request.query_params.urlencode(),
+            *(str(stats[name]) for name in sorted(stats)),
+        ])
+        return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+    
+    def list(self, request, *args, **kwargs):
+        # Условный GET: если данные не менялись, отвечаем 304 без сериализации
+        etag = quote_etag(self.get_list_etag())
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return self.set_list_cache_headers(not_modified, etag)
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = PostListRowSerializer(page, many=True)
+            response = self.get_paginated_response(serializer.data)
+        else:
+            serializer = PostListRowSerializer(queryset, many=True)
+            response = Response(serializer.data)
+        
+        return self.set_list_cache_headers(response, etag)
+    
+    def set_list_cache_headers(self, response, etag):
+        # Одинаковые заголовки для 200 и 304: гости и авторизованные видят разные списки
+        response['ETag'] = etag
+        patch_vary_headers(response, ['Authorization'])
+        return response
+    
     def perform_create(self, serializer):
         # Автоматически устанавливаем текущего пользователя как автора
         serializer.save(author=self.request.user)
@@ -86,7 +160,12 @@ class PostViewSet(viewsets.ModelViewSet):
         GET /api/v1/posts/{id}/comments/ - получить список комментариев
         """
         post = self.get_object()
-        comments = post.comments.all().select_related('author')
+        comments = post.comments.select_related('author').order_by('-created_at')
+        # Пагинация на уровне БД: выбираем только комментарии текущей страницы
+        page = self.paginate_queryset(comments)
+        if page is not None:
+            serializer = CommentSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         serializer = CommentSerializer(comments, many=True)
         return Response(serializer.data)
 